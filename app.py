@@ -1,6 +1,8 @@
 import streamlit as st
 import os
 from chatbot import HiringAssistant
+from search import peek_search_index
+from metrics import configure_logging, start_metrics_server, span
 from dotenv import load_dotenv
 import asyncio
 from async_timeout import timeout
@@ -127,6 +129,31 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
+# Start structured logging once per server process, and the Prometheus endpoint only if METRICS_PORT is set
+@st.cache_resource
+def start_observability():
+    configure_logging(os.getenv("LOG_LEVEL", "INFO"))
+    port = int(os.getenv("METRICS_PORT") or 0)
+    if port:
+        try:
+            return start_metrics_server(port, os.getenv("METRICS_ADDR", "127.0.0.1"))
+        except OSError as e:
+            st.warning(f"Metrics endpoint could not be started on port {port}: {e}")
+
+start_observability()
+
+# Candidates invited by prescreen.py arrive with ?assessment=<token> and go straight to their questions
+def start_assessment_from_link(hiring_assistant) -> bool:
+    token = st.query_params.get("assessment")
+    if not token:
+        return True
+    pending = hiring_assistant.db.claim_pending_assessment(token)
+    if not pending:
+        return False
+    first_question = hiring_assistant.start_pending_assessment(pending)
+    st.session_state.messages.append({"role": "assistant", "content": first_question})
+    return True
+
 # Initialize session state
 def initialize_session_state():
     if 'messages' not in st.session_state:
@@ -136,7 +163,15 @@ def initialize_session_state():
         if not api_key:
             st.error("Google API Key not found in secrets")
             st.stop()
-        st.session_state.hiring_assistant = HiringAssistant(api_key)
+        hiring_assistant = HiringAssistant(api_key, peek_search_index())
+        # Only keep the assistant once the link checks out, so a bad link can't fall through to a normal interview
+        if not start_assessment_from_link(hiring_assistant):
+            st.error("This assessment link is invalid, has expired or has already been completed.")
+            st.stop()
+        st.session_state.hiring_assistant = hiring_assistant
+        # The claim now lives in session state; the link in the invitation still works if the session is lost
+        if "assessment" in st.query_params:
+            del st.query_params["assessment"]
     if 'conversation_ended' not in st.session_state:
         st.session_state.conversation_ended = False
 
@@ -176,19 +211,22 @@ def main():
     
 
     initialize_session_state()
-    display_chat_history()
+    with span('streamlit', 'render'):
+        display_chat_history()
 
     if st.session_state.conversation_ended:
         st.success("✅ Thank you for participating in the interview! Our team will review your responses and contact you if you're a good fit.")
     else:
         user_input = st.chat_input("Type your response here...")
         if user_input:
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                loop.run_until_complete(handle_user_input(user_input))
-            finally:
-                loop.close()
+            # Whole turn including event loop setup; minus the 'stage' span this is Streamlit's share
+            with span('streamlit', 'turn'):
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                try:
+                    loop.run_until_complete(handle_user_input(user_input))
+                finally:
+                    loop.close()
             st.rerun()
 
 if __name__ == "__main__":
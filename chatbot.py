@@ -4,15 +4,22 @@ from typing import Tuple, List, Dict, Any
 import json
 from database import DatabaseHandler
 import random
+import logging
+from metrics import span, INFLIGHT_TURNS
+
+logger = logging.getLogger(__name__)
 
 class HiringAssistant:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, search_index=None, model=None, db=None):
+        # model and db can be supplied directly (e.g. by load_test.py) instead of Gemini/Supabase
         try:
-            genai.configure(api_key=api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-pro-latest')
-            self.db = DatabaseHandler()
+            if model is None:
+                genai.configure(api_key=api_key)
+                model = genai.GenerativeModel('gemini-1.5-pro-latest')
+            self.model = model
+            self.db = db if db is not None else DatabaseHandler(search_index)
         except Exception as e:
-            print(f"ERROR: Could not initialize the assistant. Exception: {e}")
+            logger.error(f"Could not initialize the assistant. Exception: {e}")
             raise e
         
         self.conversation_state = {
@@ -37,9 +44,15 @@ class HiringAssistant:
         pattern = r'^[\w\.-]+@[\w\.-]+\.\w+'        
         return re.match(pattern, email) is not None
     
+    def clean_name(self, name: str) -> str:
+        return " ".join(name.strip().split())
+    
+    def clean_phone(self, phone: str) -> str:
+        # Remove any non-digit characters to allow formats like (555) 123-4567
+        return ''.join(filter(str.isdigit, phone))
+    
     def validate_phone(self, phone: str) -> bool:
-        pattern = r'^\+?1?\d{9,15}$'
-        return re.match(pattern, phone) is not None
+        return len(self.clean_phone(phone)) == 10
     
     def validate_experience(self, experience: str) -> bool:
         try:
@@ -48,6 +61,17 @@ class HiringAssistant:
         except ValueError:
             return False
     
+    def parse_tech_stack(self, tech_stack: str) -> List[str]:
+        """Split a comma separated tech stack, dropping blanks and case-insensitive duplicates"""
+        technologies = []
+        seen = set()
+        for tech in tech_stack.split(','):
+            tech = tech.strip()
+            if tech and tech.lower() not in seen:
+                seen.add(tech.lower())
+                technologies.append(tech)
+        return technologies
+    
     def get_system_prompt(self) -> str:
         return """You are an intelligent Hiring Assistant for TalentScout, a recruitment agency specializing in technology placements. 
         Your role is to gather candidate information and assess their technical skills. Be professional, friendly, and focused on recruitment.
@@ -69,13 +93,14 @@ class HiringAssistant:
         # Take only first 3 technologies from tech stack
         for tech in tech_stack[:3]:
             try:
-                response = self.model.generate_content(prompt.format(tech=tech))
+                with span('gemini', 'generate_content'):
+                    response = self.model.generate_content(prompt.format(tech=tech))
                 question = response.text.strip()
                 # Ensure we only get the first question if multiple are generated
                 question = question.split('\n')[0].strip()
                 questions.append(question)
             except Exception as e:
-                print(f"Error generating question for {tech}: {e}")
+                logger.error(f"Error generating question for {tech}: {e}")
                 questions.append(f"Please explain your experience with {tech} and its practical applications.")
 
         return questions[:3]
@@ -85,11 +110,19 @@ class HiringAssistant:
 
     
     async def process_input(self, user_input: str) -> Tuple[str, bool]:
-        print(f"DEBUG: Current stage before processing: {self.conversation_state['current_stage']}")
+        INFLIGHT_TURNS.inc()
+        try:
+            return await self._process_input(user_input)
+        finally:
+            INFLIGHT_TURNS.dec()
+
+    async def _process_input(self, user_input: str) -> Tuple[str, bool]:
+        logger.debug("Current stage before processing: %s", self.conversation_state['current_stage'])
         
         # Handling technical questions separately
         if self.conversation_state['in_technical_questions']:
-            return await self._handle_technical_questions(user_input)
+            with span('stage', 'technical_questions'):
+                return await self._handle_technical_questions(user_input)
 
         # Identify handler
         handlers = {
@@ -103,12 +136,14 @@ class HiringAssistant:
             'tech_stack': self._handle_tech_stack
         }
 
-        handler = handlers.get(self.conversation_state['current_stage'])
+        stage = self.conversation_state['current_stage']
+        handler = handlers.get(stage)
         
         if handler:
-            response, should_exit = await handler(user_input)
+            with span('stage', stage):
+                response, should_exit = await handler(user_input)
             
-            print(f"DEBUG: Current stage after processing: {self.conversation_state['current_stage']}")
+            logger.debug("Current stage after processing: %s", self.conversation_state['current_stage'])
             return response, should_exit
 
         return "I apologize, but I've lost track of our conversation. Let's start over.", True
@@ -118,7 +153,7 @@ class HiringAssistant:
         return "Could you please share your full name?", False
 
     async def _handle_name(self, user_input: str) -> Tuple[str, bool]:
-        cleaned_name = " ".join(user_input.strip().split())
+        cleaned_name = self.clean_name(user_input)
         self.conversation_state['candidate_info']['name'] = cleaned_name
         self.conversation_state['current_stage'] = 'email'
         return f"Nice to meet you, {cleaned_name}! Could you please provide your email address?", False
@@ -147,15 +182,11 @@ class HiringAssistant:
 
     
     async def _handle_phone(self, user_input: str) -> Tuple[str, bool]:
-        # Remove any non-digit characters to allow formats like (555) 123-4567
-        digits_only = ''.join(filter(str.isdigit, user_input))
-        
-        # Check if the result is exactly 10 digits
-        if len(digits_only) != 10:
+        if not self.validate_phone(user_input):
             return "Please enter a valid 10-digit phone number.", False
         
         # Store the formatted phone number
-        self.conversation_state['candidate_info']['phone'] = digits_only
+        self.conversation_state['candidate_info']['phone'] = self.clean_phone(user_input)
         self.conversation_state['current_stage'] = 'experience'
         return "Great! How many years of experience do you have in the technology industry?", False
     
@@ -177,7 +208,9 @@ class HiringAssistant:
         return "Please list your tech stack (programming languages, frameworks, databases, tools). Separate each technology with a comma.", False
     
     async def _handle_tech_stack(self, user_input: str) -> Tuple[str, bool]:
-        tech_stack = [tech.strip() for tech in user_input.split(',')]
+        tech_stack = self.parse_tech_stack(user_input)
+        if not tech_stack:
+            return "Please list at least one technology, separated by commas.", False
         self.conversation_state['tech_stack'] = tech_stack
         
         # Save candidate information to database
@@ -198,11 +231,21 @@ class HiringAssistant:
             return f"Technical Assessment\n\nQuestion 1: {questions[0]}", False
             
         except Exception as e:
-            print(f"Error saving candidate data: {str(e)}")
+            logger.error(f"Error saving candidate data: {str(e)}")
             return "I apologize, but there was an error saving your information. Please try again later.", True
 
     
 
+    def start_pending_assessment(self, pending: Dict[str, Any]) -> str:
+        """Resume from a question set pre-generated by prescreen.py and return the first question"""
+        self.conversation_state['candidate_id'] = pending['candidate_id']
+        self.conversation_state['assessment_token'] = pending['token']
+        self.conversation_state['technical_questions'] = pending['questions']
+        self.conversation_state['answers'] = []
+        self.conversation_state['in_technical_questions'] = True
+        self.conversation_state['current_question_index'] = 0
+        return f"Technical Assessment\n\nQuestion 1: {pending['questions'][0]}"
+
     async def _handle_technical_questions(self, user_input: str) -> Tuple[str, bool]:
         current_index = self.conversation_state['current_question_index']
         self.conversation_state['answers'].append(user_input)
@@ -218,7 +261,7 @@ class HiringAssistant:
                     user_input
                 )
             except Exception as e:
-                print(f"Error saving conversation: {str(e)}")
+                logger.error(f"Error saving conversation: {str(e)}")
 
         if next_index < len(self.conversation_state['technical_questions']):
             return f"Question {next_index + 1}: {self.conversation_state['technical_questions'][next_index]}", False
@@ -230,8 +273,10 @@ class HiringAssistant:
                 self.conversation_state['technical_questions'],
                 self.conversation_state['answers']
             )
+            if self.conversation_state.get('assessment_token'):
+                self.db.complete_pending_assessment(self.conversation_state['assessment_token'])
         except Exception as e:
-            print(f"Error saving assessment: {str(e)}")
+            logger.error(f"Error saving assessment: {str(e)}")
             
         return "Technical assessment complete. Our team will review your responses.", True
 
@@ -5,9 +5,15 @@ from datetime import datetime
 from dotenv import load_dotenv
 import json
 import streamlit as st
+import logging
+from metrics import instrumented
+
+logger = logging.getLogger(__name__)
 
 class DatabaseHandler:
-    def __init__(self):
+    def __init__(self, search_index=None):
+        # Optional CandidateSearchIndex kept in sync with candidate/tech stack inserts
+        self.search_index = search_index
         
         supabase_url = st.secrets.get("SUPABASE_URL")
         supabase_key = st.secrets.get("SUPABASE_KEY")
@@ -18,25 +24,41 @@ class DatabaseHandler:
 
         self.supabase = create_client(supabase_url, supabase_key)
         
+    @staticmethod
+    def normalize_email(email: str) -> str:
+        # Emails are stored and compared lowercased so case variants count as the same candidate
+        return (email or '').strip().lower()
+
+    @staticmethod
+    def _candidate_row(candidate_info: dict) -> dict:
+        return {
+            'name': candidate_info.get('name'),
+            'email': DatabaseHandler.normalize_email(candidate_info.get('email')),
+            'phone': candidate_info.get('phone'),
+            'experience': float(candidate_info.get('experience', 0)),
+            'position': candidate_info.get('position'),
+            'location': candidate_info.get('location'),
+            'created_at': datetime.utcnow().isoformat()
+        }
+
+    @instrumented('supabase')
     def save_candidate(self, candidate_info: dict) -> int:
         """Save candidate information and return candidate_id"""
         try:
-            result = self.supabase.table('candidates').insert({
-                'name': candidate_info.get('name'),
-                'email': candidate_info.get('email'),
-                'phone': candidate_info.get('phone'),
-                'experience': float(candidate_info.get('experience', 0)),
-                'position': candidate_info.get('position'),
-                'location': candidate_info.get('location'),
-                'created_at': datetime.utcnow().isoformat()
-            }).execute()
+            result = self.supabase.table('candidates').insert(
+                self._candidate_row(candidate_info)
+            ).execute()
             
-            return result.data[0]['id']
+            candidate_id = result.data[0]['id']
+            if self.search_index is not None:
+                self.search_index.add_candidate(candidate_id, candidate_info)
+            return candidate_id
             
         except Exception as e:
-            print(f"Error saving candidate: {str(e)}")
+            logger.error(f"Error saving candidate: {str(e)}")
             raise
             
+    @instrumented('supabase')
     def save_tech_stack(self, candidate_id: int, tech_stack: list):
         """Save candidate's tech stack"""
         try:
@@ -45,10 +67,14 @@ class DatabaseHandler:
             
             self.supabase.table('tech_stack').insert(tech_data).execute()
             
+            if self.search_index is not None:
+                self.search_index.add_tech_stack(candidate_id, tech_stack)
+            
         except Exception as e:
-            print(f"Error saving tech stack: {str(e)}")
+            logger.error(f"Error saving tech stack: {str(e)}")
             raise
             
+    @instrumented('supabase')
     def save_assessment(self, candidate_id: int, questions: list, answers: list):
         """Save technical assessment results"""
         try:
@@ -64,9 +90,10 @@ class DatabaseHandler:
             self.supabase.table('technical_assessments').insert(assessment_data).execute()
             
         except Exception as e:
-            print(f"Error saving assessment: {str(e)}")
+            logger.error(f"Error saving assessment: {str(e)}")
             raise
             
+    @instrumented('supabase')
     def save_conversation(self, candidate_id: int, role: str, message: str):
         """Save conversation history"""
         try:
@@ -78,18 +105,148 @@ class DatabaseHandler:
             }).execute()
             
         except Exception as e:
-            print(f"Error saving conversation: {str(e)}")
+            logger.error(f"Error saving conversation: {str(e)}")
             raise
             
+    @instrumented('supabase')
     def get_candidate_by_email(self, email: str):
         """Retrieve candidate information by email"""
         try:
             result = self.supabase.table('candidates')\
                 .select('*')\
-                .eq('email', email)\
+                .eq('email', self.normalize_email(email))\
+                .execute()
+            return result.data[0] if result.data else None
+            
+        except Exception as e:
+            logger.error(f"Error retrieving candidate: {str(e)}")
+            raise
+
+    def _fetch_all(self, table: str, columns: str, after_id: int = 0, page_size: int = 1000) -> list:
+        """Page through rows with id > after_id, since Supabase caps the rows returned per request"""
+        rows = []
+        while True:
+            result = self.supabase.table(table)\
+                .select(columns)\
+                .gt('id', after_id)\
+                .order('id')\
+                .limit(page_size)\
+                .execute()
+            rows.extend(result.data)
+            if len(result.data) < page_size:
+                return rows
+            after_id = result.data[-1]['id']
+
+    @instrumented('supabase')
+    def get_all_candidates(self, after_id: int = 0) -> list:
+        """Retrieve the fields needed to build the candidate search index"""
+        try:
+            return self._fetch_all('candidates', 'id, experience, location', after_id)
+            
+        except Exception as e:
+            logger.error(f"Error retrieving candidates: {str(e)}")
+            raise
+
+    @instrumented('supabase')
+    def get_all_tech_stacks(self, after_id: int = 0) -> list:
+        """Retrieve every candidate/technology pair"""
+        try:
+            return self._fetch_all('tech_stack', 'id, candidate_id, technology', after_id)
+            
+        except Exception as e:
+            logger.error(f"Error retrieving tech stacks: {str(e)}")
+            raise
+
+    @instrumented('supabase')
+    def get_candidates_by_ids(self, candidate_ids: list) -> list:
+        """Retrieve candidate information for a list of ids"""
+        if not candidate_ids:
+            return []
+        try:
+            result = self.supabase.table('candidates')\
+                .select('*')\
+                .in_('id', candidate_ids)\
                 .execute()
+            return result.data
+            
+        except Exception as e:
+            logger.error(f"Error retrieving candidates: {str(e)}")
+            raise
+
+    @instrumented('supabase')
+    def get_existing_emails(self, emails: list, chunk_size: int = 200) -> set:
+        """Return which of the given emails (lowercased) already belong to a candidate"""
+        emails = sorted({self.normalize_email(email) for email in emails})
+        existing = set()
+        try:
+            # Chunked only to keep the filter within URL length limits
+            for start in range(0, len(emails), chunk_size):
+                result = self.supabase.table('candidates')\
+                    .select('email')\
+                    .in_('email', emails[start:start + chunk_size])\
+                    .execute()
+                existing.update(self.normalize_email(row['email']) for row in result.data)
+            return existing
+            
+        except Exception as e:
+            logger.error(f"Error retrieving candidate emails: {str(e)}")
+            raise
+
+    @instrumented('supabase')
+    def save_prescreened_candidates(self, candidates: list) -> list:
+        """Save candidates with their tech stacks and pre-generated question sets in one transaction.
+
+        Each item is a candidate_info dict plus 'tech_stack', 'token' and 'questions'.
+        Returns candidate ids in the same order; on error nothing from the batch is saved.
+        """
+        if not candidates:
+            return []
+        try:
+            payload = []
+            for candidate_info in candidates:
+                row = self._candidate_row(candidate_info)
+                del row['created_at']
+                row.update({
+                    'tech_stack': candidate_info['tech_stack'],
+                    'token': candidate_info['token'],
+                    'questions': candidate_info['questions']
+                })
+                payload.append(row)
+            result = self.supabase.rpc('prescreen_batch', {'p_candidates': payload}).execute()
+            
+            ids_by_email = {row['candidate_email']: row['new_candidate_id'] for row in result.data}
+            candidate_ids = [ids_by_email[row['email']] for row in payload]
+            if self.search_index is not None:
+                for candidate_id, candidate_info in zip(candidate_ids, candidates):
+                    self.search_index.add_candidate(candidate_id, candidate_info)
+                    self.search_index.add_tech_stack(candidate_id, candidate_info['tech_stack'])
+            return candidate_ids
+            
+        except Exception as e:
+            logger.error(f"Error saving prescreened candidates: {str(e)}")
+            raise
+
+    @instrumented('supabase')
+    def claim_pending_assessment(self, token: str):
+        """Atomically mark a pre-generated assessment as started and return it.
+
+        A started assessment can be claimed again for a while after its first claim, so a
+        refresh doesn't lock the candidate out. Returns None for unknown, expired or completed links.
+        """
+        try:
+            result = self.supabase.rpc('claim_pending_assessment', {'p_token': token}).execute()
             return result.data[0] if result.data else None
             
         except Exception as e:
-            print(f"Error retrieving candidate: {str(e)}")
+            logger.error(f"Error claiming pending assessment: {str(e)}")
+            raise
+
+    @instrumented('supabase')
+    def complete_pending_assessment(self, token: str):
+        """Mark a started pre-generated assessment as completed"""
+        try:
+            self.supabase.rpc('complete_pending_assessment', {'p_token': token}).execute()
+            
+        except Exception as e:
+            logger.error(f"Error completing pending assessment: {str(e)}")
             raise
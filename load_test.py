@@ -0,0 +1,291 @@
+"""Deterministic load test for HiringAssistant.
+
+Drives simulated candidates through every interview stage and the technical
+questions using local stand-ins for the Gemini model and DatabaseHandler, so it
+needs neither a Google API key nor a Supabase project.
+
+    python load_test.py --sessions 2000 --concurrency 200
+    python load_test.py --update-baseline      # record the current numbers
+    python load_test.py --tolerance 0.2        # fail if >20% worse than baseline
+
+Exit status is 1 on a regression and 2 when there is no baseline recorded
+with the same settings to compare against.
+
+Like app.py, each session runs on its own thread and every turn gets a fresh
+event loop. The stand-ins block with time.sleep, as the real generate_content
+and Supabase clients do, so --concurrency sessions wait on I/O in parallel.
+"""
+import argparse
+import asyncio
+import gc
+import itertools
+import json
+import math
+import os
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from chatbot import HiringAssistant
+from metrics import configure_logging
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'load_test_baseline.json')
+
+TECHNOLOGIES = ['Python', 'Go', 'Kafka', 'React', 'PostgreSQL', 'Docker',
+                'Kubernetes', 'Java', 'TypeScript', 'AWS', 'Redis', 'Rust']
+LOCATIONS = ['Berlin', 'Bangalore', 'London', 'New York', 'Remote']
+POSITIONS = ['Backend Engineer', 'Data Engineer', 'Frontend Developer', 'SRE']
+GATED_STAGES = ('email', 'tech_stack', 'technical_questions')
+
+class LatencyModel:
+    """Log-normal latency with a fixed error rate, drawn from a seeded RNG"""
+
+    def __init__(self, rng: random.Random, median_ms: float, sigma: float, error_rate: float):
+        self.rng = rng
+        self.mu = math.log(median_ms / 1000) if median_ms > 0 else None
+        self.sigma = sigma
+        self.error_rate = error_rate
+
+    def wait(self, operation: str):
+        if self.mu is not None:
+            time.sleep(self.rng.lognormvariate(self.mu, self.sigma))
+        if self.error_rate and self.rng.random() < self.error_rate:
+            raise RuntimeError(f"Simulated failure in {operation}")
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """Stand-in for genai.GenerativeModel"""
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+
+    def start_chat(self, history=None):
+        return None
+
+    def generate_content(self, prompt: str) -> FakeResponse:
+        self.latency.wait('generate_content')
+        return FakeResponse(f"What is a common pitfall when working with this technology?\n({len(prompt)})")
+
+class FakeDatabaseHandler:
+    """Stand-in for DatabaseHandler that keeps rows in memory"""
+
+    _ids = itertools.count(1)
+
+    def __init__(self, latency: LatencyModel):
+        self.latency = latency
+        self.search_index = None
+
+    def save_candidate(self, candidate_info: dict) -> int:
+        self.latency.wait('save_candidate')
+        return next(FakeDatabaseHandler._ids)
+
+    def save_tech_stack(self, candidate_id: int, tech_stack: list):
+        self.latency.wait('save_tech_stack')
+
+    def save_assessment(self, candidate_id: int, questions: list, answers: list):
+        self.latency.wait('save_assessment')
+
+    def save_conversation(self, candidate_id: int, role: str, message: str):
+        self.latency.wait('save_conversation')
+
+    def get_candidate_by_email(self, email: str):
+        self.latency.wait('get_candidate_by_email')
+        return None
+
+def candidate_script(index: int, rng: random.Random) -> List[str]:
+    """User messages for one full interview: eight stages plus three answers"""
+    tech_stack = rng.sample(TECHNOLOGIES, 4)
+    return [
+        "Hello",
+        f"Candidate {index}",
+        f"candidate{index}@example.com",
+        f"{rng.randrange(10 ** 9, 10 ** 10)}",
+        f"{rng.randrange(0, 20)}",
+        rng.choice(POSITIONS),
+        rng.choice(LOCATIONS),
+        ", ".join(tech_stack),
+        "First answer.",
+        "Second answer.",
+        "Third answer."
+    ]
+
+def build_assistant(args, index: int) -> HiringAssistant:
+    rng = random.Random(f"{args.seed}-{index}")
+    model = FakeGenerativeModel(LatencyModel(rng, args.gemini_ms, args.sigma, args.gemini_error_rate))
+    db = FakeDatabaseHandler(LatencyModel(rng, args.db_ms, args.sigma, args.db_error_rate))
+    return HiringAssistant(api_key=None, model=model, db=db)
+
+def run_session(args, index: int, latencies: Dict[str, List[float]], errors: Dict[str, int],
+                lock: threading.Lock):
+    assistant = build_assistant(args, index)
+    for message in candidate_script(index, random.Random(f"{args.seed}-script-{index}")):
+        stage = ('technical_questions' if assistant.conversation_state['in_technical_questions']
+                 else assistant.conversation_state['current_stage'])
+        start = time.perf_counter()
+        try:
+            _, should_exit = asyncio.run(assistant.process_input(message))
+            failed = False
+        except Exception:
+            # Unhandled failures end the session, as they would in app.py
+            should_exit = failed = True
+        elapsed = time.perf_counter() - start
+        with lock:
+            latencies.setdefault(stage, []).append(elapsed)
+            if failed:
+                errors[stage] = errors.get(stage, 0) + 1
+        if should_exit:
+            break
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    rank = max(0, math.ceil(fraction * len(sorted_values)) - 1)
+    return sorted_values[rank]
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    values = sorted(values)
+    return {
+        'p50_ms': percentile(values, 0.50) * 1000,
+        'p95_ms': percentile(values, 0.95) * 1000,
+        'p99_ms': percentile(values, 0.99) * 1000
+    }
+
+def measure_latency(args) -> dict:
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        futures = [executor.submit(run_session, args, i, latencies, errors, lock) for i in range(args.sessions)]
+        for future in futures:
+            future.result()
+    elapsed = time.perf_counter() - start
+
+    all_turns = [value for values in latencies.values() for value in values]
+    return {
+        'turns': len(all_turns),
+        'elapsed_s': elapsed,
+        'throughput_turns_per_s': len(all_turns) / elapsed if elapsed else 0.0,
+        'unhandled_errors': errors,
+        'turn': summarize(all_turns),
+        'stages': {stage: summarize(values) for stage, values in latencies.items()}
+    }
+
+def measure_memory(args) -> float:
+    """Bytes retained per completed session, measured without simulated latency"""
+    quiet = argparse.Namespace(**{**vars(args), 'gemini_ms': 0, 'db_ms': 0,
+                                  'gemini_error_rate': 0, 'db_error_rate': 0})
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    assistants = []
+    for i in range(args.memory_sessions):
+        assistant = build_assistant(quiet, i)
+        for message in candidate_script(i, random.Random(f"{args.seed}-script-{i}")):
+            _, should_exit = asyncio.run(assistant.process_input(message))
+            if should_exit:
+                break
+        assistants.append(assistant)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / max(len(assistants), 1)
+
+def compare(result: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Return a description of every metric that regressed beyond the tolerance"""
+    regressions = []
+    # Only the stages that call Gemini/Supabase; the pure-Python turns take microseconds and are noise
+    for stage in GATED_STAGES:
+        for key in ('p50_ms', 'p95_ms', 'p99_ms'):
+            current = result['stages'].get(stage, {}).get(key, 0.0)
+            previous = baseline['stages'].get(stage, {}).get(key, 0.0)
+            if current > previous * (1 + tolerance):
+                regressions.append(f"{stage} {key}: {current:.2f} > baseline {previous:.2f}")
+    current, previous = result['throughput_turns_per_s'], baseline['throughput_turns_per_s']
+    if current < previous * (1 - tolerance):
+        regressions.append(f"throughput: {current:.1f} < baseline {previous:.1f} turns/s")
+    current, previous = result['memory_per_session_bytes'], baseline['memory_per_session_bytes']
+    if current > previous * (1 + tolerance):
+        regressions.append(f"memory per session: {current:.0f} > baseline {previous:.0f} bytes")
+    return regressions
+
+def print_report(result: dict):
+    print(f"Sessions: {result['config']['sessions']}  Turns: {result['turns']}  "
+          f"Elapsed: {result['elapsed_s']:.2f}s  Throughput: {result['throughput_turns_per_s']:.1f} turns/s")
+    print(f"Memory per session: {result['memory_per_session_bytes'] / 1024:.1f} KiB")
+    if result['unhandled_errors']:
+        print(f"Unhandled errors by stage: {result['unhandled_errors']}")
+    print(f"{'stage':<22}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    rows = list(result['stages'].items()) + [('all turns', result['turn'])]
+    for stage, stats in rows:
+        print(f"{stage:<22}{stats['p50_ms']:>10.2f}{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}")
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Load test HiringAssistant with simulated Gemini and Supabase")
+    parser.add_argument('--sessions', type=int, default=1000, help="simulated candidates")
+    parser.add_argument('--concurrency', type=int, default=100, help="sessions in flight at once, one thread each")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--gemini-ms', type=float, default=2.0, help="median generate_content latency")
+    parser.add_argument('--db-ms', type=float, default=0.5, help="median DatabaseHandler call latency")
+    parser.add_argument('--sigma', type=float, default=0.5, help="log-normal spread of simulated latencies")
+    parser.add_argument('--gemini-error-rate', type=float, default=0.0)
+    parser.add_argument('--db-error-rate', type=float, default=0.0)
+    parser.add_argument('--memory-sessions', type=int, default=200, help="sessions used for the memory pass")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed relative regression")
+    parser.add_argument('--update-baseline', action='store_true')
+    parser.add_argument('--log-level', default='CRITICAL', help="level for the app's own logs during the run")
+    parser.add_argument('--output', help="also write the results as JSON to this path")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_logging(args.log_level)
+
+    result = measure_latency(args)
+    result['memory_per_session_bytes'] = measure_memory(args)
+    result['config'] = {key: value for key, value in vars(args).items()
+                        if key not in ('baseline', 'update_baseline', 'output', 'tolerance', 'log_level')}
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(result, f, indent=2)
+
+    if args.update_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(result, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one.")
+        return 2
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('config') != result['config']:
+        differences = sorted(key for key in set(baseline.get('config', {})) | set(result['config'])
+                             if baseline.get('config', {}).get(key) != result['config'].get(key))
+        print(f"Baseline was recorded with different settings ({', '.join(differences)}); "
+              "rerun with the same settings or record a new baseline with --update-baseline.")
+        return 2
+
+    regressions = compare(result, baseline, args.tolerance)
+    if regressions:
+        print("Regressions against baseline:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print("No regressions against baseline.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
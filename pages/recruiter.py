@@ -0,0 +1,75 @@
+import hmac
+import streamlit as st
+import pandas as pd
+from database import DatabaseHandler
+from search import get_search_index
+
+st.set_page_config(layout="wide")
+
+MAX_DISPLAYED = 200
+# Seconds between automatic index refreshes; widget changes rerun the page far more often
+REFRESH_INTERVAL = 60
+
+# Recruiter-only page: it lists every candidate's contact details
+def check_recruiter_access() -> bool:
+    password = st.secrets.get("RECRUITER_PASSWORD")
+    if not password:
+        st.error("Candidate search is disabled. Set `RECRUITER_PASSWORD` in `.streamlit/secrets.toml` to enable it.")
+        return False
+    if st.session_state.get('recruiter_authenticated'):
+        return True
+    entered = st.text_input("Recruiter password", type="password")
+    if entered and hmac.compare_digest(entered.encode(), password.encode()):
+        st.session_state.recruiter_authenticated = True
+        st.rerun()
+    if entered:
+        st.error("Incorrect password.")
+    return False
+
+# Search filters
+def render_filters(index):
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        tech_stack = st.multiselect("Tech stack (all required)", index.technologies())
+    with col2:
+        min_experience, max_experience = st.slider("Years of experience", 0.0, 50.0, (0.0, 50.0), step=0.5)
+    with col3:
+        locations = st.multiselect("Location", sorted(index.locations()))
+    return tech_stack, min_experience, max_experience, locations
+
+def main():
+    st.markdown("<h1 class='title'><i>RecruitX</i> Candidate Search</h1>", unsafe_allow_html=True)
+
+    if not check_recruiter_access():
+        st.stop()
+
+    db = DatabaseHandler()
+    if not hasattr(db, 'supabase'):
+        st.stop()
+    index = get_search_index(db)
+    # Pick up candidates added by other sessions, prescreen.py or other replicas
+    refresh_now = st.button("Refresh candidates")
+    index.refresh(db, max_age=0 if refresh_now else REFRESH_INTERVAL)
+    tech_stack, min_experience, max_experience, locations = render_filters(index)
+
+    candidate_ids = index.search(
+        tech_stack=tech_stack,
+        min_experience=min_experience if min_experience > 0 else None,
+        max_experience=max_experience if max_experience < 50 else None,
+        locations=locations
+    )
+    st.write(f"**{len(candidate_ids)}** matching candidates")
+
+    if not candidate_ids:
+        return
+
+    if len(candidate_ids) > MAX_DISPLAYED:
+        st.caption(f"Showing the first {MAX_DISPLAYED} results. Narrow the filters to see more.")
+
+    candidates = db.get_candidates_by_ids(candidate_ids[:MAX_DISPLAYED])
+    if candidates:
+        columns = ['id', 'name', 'email', 'phone', 'experience', 'position', 'location']
+        st.dataframe(pd.DataFrame(candidates)[columns], use_container_width=True, hide_index=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Bulk pre-screening for campus drives.
+
+Reads a CSV of candidate profiles, generates each candidate's technical
+questions ahead of time, stores everything with bulk inserts and writes a CSV
+with a personal assessment link per candidate.
+
+    python prescreen.py candidates.csv --base-url https://recruitx.streamlit.app --output links.csv
+
+Required columns: name, email, position, tech_stack (comma or semicolon
+separated). Optional columns: phone, experience, location.
+"""
+import argparse
+import asyncio
+import csv
+import logging
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
+
+import streamlit as st
+from dotenv import load_dotenv
+
+from chatbot import HiringAssistant
+from metrics import configure_logging
+
+logger = logging.getLogger('prescreen')
+
+REQUIRED_COLUMNS = ('name', 'email', 'position', 'tech_stack')
+INSERT_BATCH_SIZE = 500
+RESULT_COLUMNS = ['name', 'email', 'status', 'link']
+
+# varchar limits from supabase-tables.sql; longer values would fail a whole bulk insert
+MAX_LENGTHS = {'name': 100, 'email': 100, 'phone': 20, 'position': 100, 'location': 100}
+MAX_TECHNOLOGY_LENGTH = 50
+
+def parse_profile(assistant: HiringAssistant, row: dict) -> Tuple[dict, List[str], str]:
+    """Validate one CSV row the same way the interactive flow does.
+
+    Returns (candidate_info, tech_stack, error); error is empty for valid rows.
+    """
+    name = assistant.clean_name(row.get('name') or '')
+    email = (row.get('email') or '').strip()
+    position = (row.get('position') or '').strip()
+    # Semicolons are accepted too so the column doesn't need quoting
+    tech_stack = assistant.parse_tech_stack((row.get('tech_stack') or '').replace(';', ','))
+    phone = (row.get('phone') or '').strip()
+    experience = (row.get('experience') or '0').strip()
+
+    if not name:
+        return {}, [], 'missing name'
+    if not assistant.validate_email(email):
+        return {}, [], 'invalid email'
+    if not position:
+        return {}, [], 'missing position'
+    if not tech_stack:
+        return {}, [], 'missing tech stack'
+    if phone and not assistant.validate_phone(phone):
+        return {}, [], 'invalid phone'
+    if not assistant.validate_experience(experience):
+        return {}, [], 'invalid experience'
+    if any(len(tech) > MAX_TECHNOLOGY_LENGTH for tech in tech_stack):
+        return {}, [], f'technology longer than {MAX_TECHNOLOGY_LENGTH} characters'
+
+    candidate_info = {
+        'name': name,
+        'email': email.lower(),
+        'phone': assistant.clean_phone(phone),
+        'experience': float(experience),
+        'position': position,
+        'location': (row.get('location') or '').strip()
+    }
+    for column, max_length in MAX_LENGTHS.items():
+        if len(candidate_info[column]) > max_length:
+            return {}, [], f'{column} longer than {max_length} characters'
+    return candidate_info, tech_stack, ''
+
+def generate_question_sets(assistant: HiringAssistant, tech_stacks: List[List[str]], workers: int) -> List[List[str]]:
+    """Run generate_tech_questions for every candidate, at most `workers` at a time"""
+    def generate(tech_stack: List[str]) -> List[str]:
+        # generate_content blocks, so each worker thread drives its own event loop
+        return asyncio.run(assistant.generate_tech_questions(tech_stack))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(generate, tech_stacks))
+
+def save_batch(assistant: HiringAssistant, batch: list, questions: List[List[str]], base_url: str):
+    """Save one batch of candidates, tech stacks and question sets atomically, filling in each result row"""
+    tokens = [secrets.token_urlsafe(16) for _ in batch]
+    assistant.db.save_prescreened_candidates([
+        {**candidate_info, 'tech_stack': tech_stack, 'token': token, 'questions': candidate_questions}
+        for (_, candidate_info, tech_stack), token, candidate_questions in zip(batch, tokens, questions)
+    ])
+
+    for (result, _, _), token in zip(batch, tokens):
+        result['status'] = 'invited'
+        result['link'] = f"{base_url.rstrip('/')}/?assessment={token}"
+
+def prescreen(assistant: HiringAssistant, rows: List[dict], base_url: str, workers: int,
+              write_results: Callable[[List[dict]], None] = lambda results: None) -> List[dict]:
+    """Process candidate rows and return one result row (name, email, status, link) per input row.
+
+    write_results is called with each group of finished rows as soon as they are final,
+    so links from saved batches survive a later failure.
+    """
+    results = []
+    profiles = []
+    seen = set()
+    for row in rows:
+        candidate_info, tech_stack, error = parse_profile(assistant, row)
+        result = {'name': (row.get('name') or '').strip(), 'email': (row.get('email') or '').strip(),
+                  'status': error, 'link': ''}
+        results.append(result)
+        if error:
+            continue
+        if candidate_info['email'] in seen:
+            result['status'] = 'duplicate in file'
+            continue
+        seen.add(candidate_info['email'])
+        profiles.append((result, candidate_info, tech_stack))
+
+    existing = assistant.db.get_existing_emails([info['email'] for _, info, _ in profiles])
+    new_profiles = []
+    for result, candidate_info, tech_stack in profiles:
+        if candidate_info['email'] in existing:
+            result['status'] = 'already interviewed'
+        else:
+            new_profiles.append((result, candidate_info, tech_stack))
+    pending = {id(result) for result, _, _ in new_profiles}
+    write_results([result for result in results if id(result) not in pending])
+    logger.info(f"{len(new_profiles)} new candidates out of {len(rows)} rows")
+
+    start = time.perf_counter()
+    question_sets = generate_question_sets(assistant, [tech_stack for _, _, tech_stack in new_profiles], workers)
+    logger.info(f"Generated {len(question_sets)} question sets in {time.perf_counter() - start:.1f}s")
+
+    for offset in range(0, len(new_profiles), INSERT_BATCH_SIZE):
+        batch = new_profiles[offset:offset + INSERT_BATCH_SIZE]
+        batch_questions = question_sets[offset:offset + INSERT_BATCH_SIZE]
+        try:
+            save_batch(assistant, batch, batch_questions, base_url)
+        except Exception as e:
+            # Nothing from the batch was saved, so rerunning the same CSV retries these rows
+            logger.error(f"Batch starting at candidate {offset + 1} failed: {e}")
+            for result, _, _ in batch:
+                result['status'] = f'failed: {e}'
+        write_results([result for result, _, _ in batch])
+
+    return results
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-generate technical assessments for a CSV of candidates")
+    parser.add_argument('input', help="CSV with name, email, position and tech_stack columns")
+    parser.add_argument('--output', default='assessment_links.csv', help="CSV to write links and statuses to")
+    parser.add_argument('--base-url', default=os.getenv("RECRUITX_BASE_URL", "http://localhost:8501"),
+                        help="URL of the running app, used to build assessment links")
+    parser.add_argument('--workers', type=int, default=16, help="concurrent question generation requests")
+    parser.add_argument('--log-level', default='INFO')
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    configure_logging(args.log_level)
+
+    with open(args.input, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            print(f"Missing required columns: {', '.join(missing)}")
+            return 1
+        rows = list(reader)
+
+    api_key = os.getenv("GOOGLE_API_KEY") or st.secrets.get("GOOGLE_API_KEY")
+    if not api_key:
+        print("Google API Key not found in environment or secrets")
+        return 1
+    assistant = HiringAssistant(api_key)
+    if not hasattr(assistant.db, 'supabase'):
+        print("Supabase credentials not found. Please set them in `.streamlit/secrets.toml`.")
+        return 1
+
+    with open(args.output, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=RESULT_COLUMNS)
+        writer.writeheader()
+
+        def write_results(finished: List[dict]):
+            writer.writerows(finished)
+            f.flush()
+
+        results = prescreen(assistant, rows, args.base_url, args.workers, write_results)
+
+    invited = sum(1 for result in results if result['status'] == 'invited')
+    print(f"Invited {invited} of {len(results)} candidates; results written to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
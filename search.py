@@ -0,0 +1,235 @@
+import threading
+import time
+from typing import Dict, List, Optional, Iterable
+import numpy as np
+from metrics import REGISTRY, span
+
+PENDING_ROWS = REGISTRY.gauge(
+    'search_index_pending_rows',
+    'Posting list entries waiting to be merged into the search index'
+)
+
+class CandidateSearchIndex:
+    """In-memory inverted index from technology to candidates, with experience and location filters.
+
+    Candidates are stored under dense row numbers so each technology maps to a
+    sorted int32 array of rows, and experience/location live in column arrays
+    that can be masked in one vectorised pass.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        self._lock = threading.Lock()
+        self._row_of: Dict[int, int] = {}
+        self._ids = np.zeros(initial_capacity, dtype=np.int64)
+        self._experience = np.zeros(initial_capacity, dtype=np.float32)
+        self._location = np.full(initial_capacity, -1, dtype=np.int32)
+        self._size = 0
+
+        self._location_codes: Dict[str, int] = {}
+        self._location_names: List[str] = []
+
+        # Sorted row arrays per technology, plus rows added since the last query
+        self._postings: Dict[str, np.ndarray] = {}
+        self._pending: Dict[str, List[int]] = {}
+
+        # Highest database ids loaded so far, so refresh() only fetches newer rows
+        self._last_candidate_id = 0
+        self._last_tech_stack_id = 0
+        self._last_refresh = 0.0
+
+    @staticmethod
+    def normalize(value: str) -> str:
+        return " ".join(str(value).strip().lower().split())
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self, needed: int):
+        capacity = len(self._ids)
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        self._ids = np.resize(self._ids, new_capacity)
+        self._experience = np.resize(self._experience, new_capacity)
+        location = np.full(new_capacity, -1, dtype=np.int32)
+        location[:self._size] = self._location[:self._size]
+        self._location = location
+
+    def _location_code(self, location: Optional[str]) -> int:
+        if not location:
+            return -1
+        key = self.normalize(location)
+        code = self._location_codes.get(key)
+        if code is None:
+            code = len(self._location_names)
+            self._location_codes[key] = code
+            self._location_names.append(key)
+        return code
+
+    def _upsert_candidate(self, candidate_id: int, experience, location) -> int:
+        row = self._row_of.get(candidate_id)
+        if row is None:
+            row = self._size
+            self._grow(row + 1)
+            self._row_of[candidate_id] = row
+            self._ids[row] = candidate_id
+            self._size += 1
+        self._experience[row] = float(experience or 0)
+        self._location[row] = self._location_code(location)
+        return row
+
+    def _add_technologies(self, row: int, tech_stack: Iterable[str]):
+        for tech in tech_stack:
+            key = self.normalize(tech)
+            if key:
+                self._pending.setdefault(key, []).append(row)
+                PENDING_ROWS.inc()
+
+    def add_candidate(self, candidate_id: int, candidate_info: dict):
+        """Add or update a single candidate's experience and location"""
+        with self._lock:
+            self._upsert_candidate(
+                candidate_id,
+                candidate_info.get('experience'),
+                candidate_info.get('location')
+            )
+
+    def add_tech_stack(self, candidate_id: int, tech_stack: list):
+        """Add technologies for a candidate, registering the candidate if unseen"""
+        with self._lock:
+            row = self._row_of.get(candidate_id)
+            if row is None:
+                row = self._upsert_candidate(candidate_id, 0, None)
+            self._add_technologies(row, tech_stack)
+
+    def bulk_load(self, candidates: list, tech_stack: list):
+        """Load candidate rows and tech_stack rows as returned by the database"""
+        with self._lock:
+            self._grow(self._size + len(candidates))
+            for candidate in candidates:
+                self._upsert_candidate(
+                    candidate['id'],
+                    candidate.get('experience'),
+                    candidate.get('location')
+                )
+                self._last_candidate_id = max(self._last_candidate_id, candidate['id'])
+
+            grouped: Dict[str, List[int]] = {}
+            for entry in tech_stack:
+                self._last_tech_stack_id = max(self._last_tech_stack_id, entry.get('id', 0))
+                row = self._row_of.get(entry['candidate_id'])
+                if row is None:
+                    # Candidate inserted after the candidates fetch; its details arrive with the next refresh
+                    row = self._upsert_candidate(entry['candidate_id'], 0, None)
+                key = self.normalize(entry['technology'])
+                if key:
+                    grouped.setdefault(key, []).append(row)
+
+            for key, rows in grouped.items():
+                self._pending.setdefault(key, []).extend(rows)
+            self._flush_pending()
+
+    def refresh(self, db, max_age: float = 0):
+        """Load candidates and tech stack rows inserted since the last load, e.g. by prescreen.py or another replica.
+
+        Does nothing if the last refresh was less than max_age seconds ago.
+        """
+        now = time.monotonic()
+        if self._last_refresh and now - self._last_refresh < max_age:
+            return
+        self._last_refresh = now
+        candidates = db.get_all_candidates(after_id=self._last_candidate_id)
+        tech_stack = db.get_all_tech_stacks(after_id=self._last_tech_stack_id)
+        self.bulk_load(candidates, tech_stack)
+
+    def _flush_pending(self):
+        for key, rows in self._pending.items():
+            added = np.unique(np.asarray(rows, dtype=np.int32))
+            existing = self._postings.get(key)
+            if existing is None or not len(existing):
+                self._postings[key] = added
+            elif added[0] > existing[-1]:
+                # New candidates get the highest row numbers, so this is the usual case
+                self._postings[key] = np.concatenate((existing, added))
+            else:
+                # Merge into the sorted array without re-sorting it
+                positions = np.searchsorted(existing, added)
+                in_range = positions < len(existing)
+                duplicate = np.zeros(len(added), dtype=bool)
+                duplicate[in_range] = existing[positions[in_range]] == added[in_range]
+                self._postings[key] = np.insert(existing, positions[~duplicate], added[~duplicate])
+        self._pending.clear()
+        PENDING_ROWS.set(0)
+
+    def technologies(self) -> List[str]:
+        with self._lock:
+            self._flush_pending()
+            return sorted(self._postings)
+
+    def locations(self) -> List[str]:
+        return list(self._location_names)
+
+    def search(self, tech_stack: Optional[List[str]] = None,
+               min_experience: Optional[float] = None,
+               max_experience: Optional[float] = None,
+               locations: Optional[List[str]] = None,
+               limit: Optional[int] = None) -> List[int]:
+        """Return ids of candidates that know every technology and match the filters"""
+        with self._lock, span('search', 'query'):
+            if self._pending:
+                self._flush_pending()
+
+            rows = None
+            if tech_stack:
+                postings = []
+                for tech in tech_stack:
+                    posting = self._postings.get(self.normalize(tech))
+                    if posting is None:
+                        return []
+                    postings.append(posting)
+                # Intersect smallest lists first so the working set shrinks quickly
+                postings.sort(key=len)
+                rows = postings[0]
+                for posting in postings[1:]:
+                    if not len(rows):
+                        break
+                    rows = np.intersect1d(rows, posting, assume_unique=True)
+            else:
+                rows = np.arange(self._size, dtype=np.int32)
+
+            mask = np.ones(len(rows), dtype=bool)
+            if min_experience is not None:
+                mask &= self._experience[rows] >= min_experience
+            if max_experience is not None:
+                mask &= self._experience[rows] <= max_experience
+            if locations:
+                codes = [self._location_codes[self.normalize(loc)]
+                         for loc in locations
+                         if self.normalize(loc) in self._location_codes]
+                if not codes:
+                    return []
+                mask &= np.isin(self._location[rows], codes)
+
+            rows = rows[mask]
+            if limit is not None:
+                rows = rows[:limit]
+            return self._ids[rows].tolist()
+
+
+
+_shared_index: Optional[CandidateSearchIndex] = None
+_shared_index_lock = threading.Lock()
+
+def get_search_index(db) -> CandidateSearchIndex:
+    """Return the process-wide search index, loading it from the database on first use"""
+    global _shared_index
+    with _shared_index_lock:
+        if _shared_index is None:
+            index = CandidateSearchIndex()
+            index.refresh(db)
+            _shared_index = index
+    return _shared_index
+
+def peek_search_index() -> Optional[CandidateSearchIndex]:
+    """Return the process-wide search index if it has been built, without loading it"""
+    return _shared_index
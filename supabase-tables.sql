@@ -3,6 +3,7 @@ alter table candidates enable row level security;
 alter table tech_stack enable row level security;
 alter table technical_assessments enable row level security;
 alter table conversation_history enable row level security;
+alter table pending_assessments enable row level security;
 
 -- Create tables
 create table candidates (
@@ -16,6 +17,9 @@ create table candidates (
     created_at timestamp with time zone default timezone('utc'::text, now()) not null
 );
 
+-- Emails are stored lowercased; this also rejects case variants of rows saved before that
+create unique index candidates_email_lower_idx on candidates (lower(email));
+
 create table tech_stack (
     id bigint primary key generated always as identity,
     candidate_id bigint references candidates(id),
@@ -39,6 +43,16 @@ create table conversation_history (
     timestamp timestamp with time zone default timezone('utc'::text, now()) not null
 );
 
+create table pending_assessments (
+    id bigint primary key generated always as identity,
+    candidate_id bigint references candidates(id),
+    token varchar(64) unique not null,
+    questions jsonb not null,
+    status varchar(20) default 'pending' not null,
+    started_at timestamp with time zone,
+    created_at timestamp with time zone default timezone('utc'::text, now()) not null
+);
+
 -- Create policies
 create policy "Enable read access for all users" on candidates for select using (true);
 create policy "Enable insert access for all users" on candidates for insert with check (true);
@@ -51,3 +65,60 @@ create policy "Enable insert access for all users" on technical_assessments for
 
 create policy "Enable read access for all users" on conversation_history for select using (true);
 create policy "Enable insert access for all users" on conversation_history for insert with check (true);
+
+-- No public policies on pending_assessments: tokens are only written and read through the functions below
+
+-- Insert a prescreen.py batch (candidates, tech stacks, question sets) in one transaction,
+-- so a failure leaves nothing half-saved for a rerun to skip
+create or replace function prescreen_batch(p_candidates jsonb)
+returns table (candidate_email text, new_candidate_id bigint)
+language plpgsql security definer set search_path = public as $$
+declare
+    entry jsonb;
+    inserted_id bigint;
+begin
+    for entry in select value from jsonb_array_elements(p_candidates) loop
+        insert into candidates (name, email, phone, experience, position, location)
+        values (entry->>'name', lower(entry->>'email'), entry->>'phone',
+                (entry->>'experience')::decimal, entry->>'position', entry->>'location')
+        returning id into inserted_id;
+
+        insert into tech_stack (candidate_id, technology)
+        select inserted_id, technology from jsonb_array_elements_text(entry->'tech_stack') as technology;
+
+        insert into pending_assessments (candidate_id, token, questions)
+        values (inserted_id, entry->>'token', entry->'questions');
+
+        candidate_email := lower(entry->>'email');
+        new_candidate_id := inserted_id;
+        return next;
+    end loop;
+end;
+$$;
+
+-- Claim a link: pending -> started. A started link can be reopened (after a refresh or dropped
+-- connection) for 2 hours from its first claim; once completed it is never returned again
+create or replace function claim_pending_assessment(p_token text)
+returns setof pending_assessments
+language sql security definer set search_path = public as $$
+    update pending_assessments
+    set status = 'started', started_at = coalesce(started_at, now())
+    where token = p_token
+      and (status = 'pending'
+           or (status = 'started' and started_at > now() - interval '2 hours'))
+    returning *;
+$$;
+
+create or replace function complete_pending_assessment(p_token text)
+returns void
+language sql security definer set search_path = public as $$
+    update pending_assessments set status = 'completed'
+    where token = p_token and status = 'started';
+$$;
+
+revoke all on function prescreen_batch(jsonb) from public;
+revoke all on function claim_pending_assessment(text) from public;
+revoke all on function complete_pending_assessment(text) from public;
+grant execute on function prescreen_batch(jsonb) to anon, authenticated;
+grant execute on function claim_pending_assessment(text) to anon, authenticated;
+grant execute on function complete_pending_assessment(text) to anon, authenticated;
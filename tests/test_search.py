@@ -0,0 +1,91 @@
+import numpy as np
+
+from search import CandidateSearchIndex
+
+class FakeDatabase:
+    """Serves candidates/tech_stack rows with id > after_id, like DatabaseHandler"""
+
+    def __init__(self):
+        self.candidates = []
+        self.tech_stack = []
+
+    def get_all_candidates(self, after_id: int = 0) -> list:
+        return [row for row in self.candidates if row['id'] > after_id]
+
+    def get_all_tech_stacks(self, after_id: int = 0) -> list:
+        return [row for row in self.tech_stack if row['id'] > after_id]
+
+def candidate(candidate_id, experience=0, location='Berlin'):
+    return {'id': candidate_id, 'experience': experience, 'location': location}
+
+def tech(row_id, candidate_id, technology):
+    return {'id': row_id, 'candidate_id': candidate_id, 'technology': technology}
+
+def test_search_filters_by_tech_experience_and_location():
+    index = CandidateSearchIndex()
+    index.bulk_load(
+        [candidate(1, 5, 'Berlin'), candidate(2, 1, 'Berlin'), candidate(3, 6, 'London')],
+        [tech(1, 1, 'Go'), tech(2, 1, 'Kafka'), tech(3, 2, 'Go'), tech(4, 2, 'Kafka'),
+         tech(5, 3, 'go'), tech(6, 3, 'Kafka')]
+    )
+
+    assert index.search(['kafka', 'GO']) == [1, 2, 3]
+    assert index.search(['Go', 'Kafka'], min_experience=3, locations=['berlin']) == [1]
+    assert index.search(['Rust']) == []
+
+def test_tech_row_for_unknown_candidate_is_not_lost():
+    index = CandidateSearchIndex()
+    index.bulk_load([candidate(1)], [tech(1, 1, 'Go'), tech(2, 2, 'Go')])
+    index.bulk_load([candidate(2, 4, 'London')], [])
+
+    assert index.search(['go']) == [1, 2]
+    assert index.search(['go'], locations=['London']) == [2]
+
+def test_refresh_picks_up_candidate_inserted_between_fetches():
+    db = FakeDatabase()
+    db.candidates.append(candidate(1))
+    db.tech_stack.append(tech(1, 1, 'Go'))
+    index = CandidateSearchIndex()
+    index.refresh(db)
+
+    # Candidate 2 and its tech stack land after refresh fetched candidates but before it fetched tech_stack
+    original = db.get_all_tech_stacks
+    def racing_fetch(after_id=0):
+        db.candidates.append(candidate(2, 7, 'London'))
+        db.tech_stack.append(tech(2, 2, 'Go'))
+        return original(after_id)
+    db.get_all_tech_stacks = racing_fetch
+    index.refresh(db)
+    db.get_all_tech_stacks = original
+    index.refresh(db)
+
+    assert index.search(['go']) == [1, 2]
+    assert index.search(['go'], min_experience=5) == [2]
+
+def test_refresh_is_throttled_by_max_age():
+    db = FakeDatabase()
+    index = CandidateSearchIndex()
+    index.refresh(db)
+    db.candidates.append(candidate(1))
+    db.tech_stack.append(tech(1, 1, 'Go'))
+
+    index.refresh(db, max_age=60)
+    assert index.search(['go']) == []
+    index.refresh(db, max_age=0)
+    assert index.search(['go']) == [1]
+
+def test_incremental_adds_keep_postings_sorted_and_unique():
+    index = CandidateSearchIndex()
+    index.bulk_load([candidate(i) for i in range(1, 6)],
+                    [tech(i, i, 'Go') for i in (1, 3, 5)])
+
+    # New candidate appended after existing rows, and older candidates merged into the middle
+    index.add_candidate(6, {'experience': 2, 'location': 'Berlin'})
+    index.add_tech_stack(6, ['Go'])
+    index.add_tech_stack(2, ['Go', 'go'])
+    index.add_tech_stack(3, ['Go'])
+    index.add_tech_stack(4, ['Go'])
+
+    assert index.search(['go']) == [1, 2, 3, 4, 5, 6]
+    posting = index._postings['go']
+    assert np.all(np.diff(posting) > 0)